@@ -0,0 +1,76 @@
+import random
+import unittest
+
+import engine
+
+
+def pass_loop(rules, initial):
+    """The original while-changed engine: the reference firing order."""
+    current = set(initial)
+    applied = []
+    changed = True
+    while changed:
+        changed = False
+        for i, (pre, post) in enumerate(rules):
+            if i in applied:
+                continue
+            if pre <= current:
+                if not post <= current:
+                    current |= post
+                    changed = True
+                applied.append(i)
+    return current, applied
+
+
+class FireOrderTest(unittest.TestCase):
+    """fire() must fire rules in the same order as the pass loop."""
+
+    def setUp(self):
+        self._tables = (engine.rule_pre_counts, engine.rule_post_masks, engine.dependents)
+
+    def tearDown(self):
+        engine.rule_pre_counts, engine.rule_post_masks, engine.dependents = self._tables
+
+    def fire(self, rules, initial):
+        # encode the table locally and swap it in for engine's own
+        atoms = sorted(set(initial).union(*(pre | post for pre, post in rules)))
+        sid = {atom: n for n, atom in enumerate(atoms)}
+
+        def mask(states):
+            return sum(1 << sid[s] for s in states)
+
+        dependents = [[] for _ in atoms]
+        for i, (pre, _) in enumerate(rules):
+            for s in pre:
+                dependents[sid[s]].append(i)
+        engine.rule_pre_counts = tuple(len(pre) for pre, _ in rules)
+        engine.rule_post_masks = tuple(mask(post) for _, post in rules)
+        engine.dependents = tuple(map(tuple, dependents))
+
+        cur, order = engine.fire.__wrapped__(mask(initial))
+        return {s for s in atoms if cur >> sid[s] & 1}, list(order)
+
+    def test_rule_woken_by_later_rule_waits_for_next_pass(self):
+        rules = [({"x"}, {"y"}), ({"y"}, set()), ({"x"}, set())]
+        self.assertEqual(self.fire(rules, {"x"}), ({"x", "y"}, [0, 1, 2]))
+        self.assertEqual(self.fire(rules, {"x"}), pass_loop(rules, {"x"}))
+
+    def test_random_tables_match_pass_loop(self):
+        rng = random.Random(0)
+        atoms = "abcdefgh"
+        for _ in range(500):
+            rules = [
+                (set(rng.sample(atoms, rng.randint(0, 3))),
+                 set(rng.sample(atoms, rng.randint(0, 2))))
+                for _ in range(rng.randint(1, 8))
+            ]
+            initial = set(rng.sample(atoms, rng.randint(0, 3)))
+            with self.subTest(rules=rules, initial=initial):
+                self.assertEqual(self.fire(rules, initial), pass_loop(rules, initial))
+
+    def test_bundled_scenario_order(self):
+        self.assertEqual(engine.run()["applied_rules"], (0, 1, 2, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
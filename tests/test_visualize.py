@@ -0,0 +1,93 @@
+import os
+import unittest
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import matplotlib.pyplot as plt
+import networkx as nx
+
+import engine
+import visualize
+
+
+LABEL_GROUPS = {
+    "Assumed State": "assumed",
+    "Inferred State": "inferred",
+    "Attack Action": "rule"
+}
+
+
+class RedrawAfterMutationTest(unittest.TestCase):
+    """render_graph() must follow graph edits between draws."""
+
+    def setUp(self):
+        self._show = plt.show
+        plt.show = lambda *args, **kwargs: None
+        self._draw_nodes = nx.draw_networkx_nodes
+        self.drawn = {}
+
+        def draw_nodes(G, pos, nodelist=None, label=None, **kwargs):
+            self.drawn[LABEL_GROUPS[label]] = list(nodelist)
+            return self._draw_nodes(G, pos, nodelist=nodelist, label=label, **kwargs)
+
+        nx.draw_networkx_nodes = draw_nodes
+        result = engine.run()
+        self.G = visualize.build_graph(result["nodes"], result["edges"])
+        visualize.render_graph(self.G)
+
+    def tearDown(self):
+        plt.show = self._show
+        nx.draw_networkx_nodes = self._draw_nodes
+        plt.close("all")
+
+    def groups(self):
+        # node lists handed to draw_networkx_nodes on the last draw
+        return self.drawn
+
+    def test_unchanged_graph_reuses_cache(self):
+        cache = self.G.graph["_viz_cache"]
+        visualize.render_graph(self.G)
+        self.assertIs(self.G.graph["_viz_cache"], cache)
+
+    def test_removed_node_is_not_drawn(self):
+        rule_node = "[RULE] Privilege Escalation on B"
+        self.G.remove_node(rule_node)
+        visualize.render_graph(self.G)
+        self.assertNotIn(rule_node, self.groups()["rule"])
+        self.assertNotIn(rule_node, self.G.graph["_viz_cache"]["pos"])
+
+    def test_added_node_is_drawn(self):
+        self.G.add_node("user_access:C", type="state", origin="inferred", event_id=5)
+        visualize.render_graph(self.G)
+        self.assertIn("user_access:C", self.groups()["inferred"])
+        self.assertIn("user_access:C", self.G.graph["_viz_cache"]["pos"])
+
+    def test_same_size_swap_is_drawn(self):
+        old = "[RULE] Privilege Escalation on B"
+        edges = list(self.G.in_edges(old)) + list(self.G.out_edges(old))
+        attrs = dict(self.G.nodes[old])
+        self.G.remove_node(old)
+        self.G.add_node("[RULE] X", **attrs)
+        self.G.add_edges_from(
+            ("[RULE] X" if u == old else u, "[RULE] X" if v == old else v)
+            for u, v in edges
+        )
+        visualize.render_graph(self.G)
+        self.assertIn("[RULE] X", self.groups()["rule"])
+        self.assertNotIn(old, self.G.graph["_viz_cache"]["pos"])
+
+    def test_relabelled_node_is_drawn(self):
+        nx.relabel_nodes(self.G, {"admin_access:B": "root:B"}, copy=False)
+        visualize.render_graph(self.G)
+        self.assertIn("root:B", self.groups()["inferred"])
+        self.assertIn("root:B", self.G.graph["_viz_cache"]["pos"])
+
+    def test_attribute_edit_moves_node_group(self):
+        self.G.nodes["vuln_lateral:B"]["origin"] = "inferred"
+        visualize.render_graph(self.G)
+        self.assertIn("vuln_lateral:B", self.groups()["inferred"])
+        self.assertNotIn("vuln_lateral:B", self.groups()["assumed"])
+
+
+if __name__ == "__main__":
+    unittest.main()